@@ -3,7 +3,7 @@ import re
 import time
 from binascii import unhexlify
 from decimal import Decimal
-from typing import List, NamedTuple, Optional
+from typing import List, NamedTuple, Optional, Tuple
 
 import bitstring  # type: ignore
 import embit
@@ -121,6 +121,54 @@ def decode(pr: str) -> Invoice:
     return invoice
 
 
+def parse_amount_and_hash(pr: str) -> Tuple[int, str]:
+    """Extract only the amount (in msat) and the payment hash of an invoice.
+
+    Unlike `decode`, this skips every other tagged field and does not verify
+    the signature. It picks the same payment hash as `decode` (the last valid
+    `p` field), but the hash of an invoice that actually got paid should
+    still be taken from `pay_invoice`.
+    """
+
+    hrp, decoded_data = bech32_decode(pr)
+    if hrp is None or decoded_data is None:
+        raise ValueError("Bad bech32 checksum")
+    if not hrp.startswith("ln"):
+        raise ValueError("Does not start with ln")
+
+    amount_msat = 0
+    m = re.search(r"[^\d]+", hrp[2:])
+    if m:
+        amountstr = hrp[2 + m.end() :]
+        if amountstr != "":
+            amount_msat = _unshorten_amount(amountstr)
+
+    # drop the 65 bytes signature (104 groups of 5 bits) and the 35 bits date
+    if len(decoded_data) < 104 + 7:
+        raise ValueError("Too short to contain signature")
+    data = decoded_data[7:-104]
+
+    # like `decode`, walk all tagged fields and let the last valid `p` win
+    payment_hash = None
+    pos = 0
+    while pos != len(data):
+        if pos + 3 > len(data):
+            raise ValueError("Truncated tagged field")
+        tag = CHARSET[data[pos]]
+        length = data[pos + 1] * 32 + data[pos + 2]
+        pos += 3
+        if pos + length > len(data):
+            raise ValueError("Truncated tagged field")
+        if tag == "p" and length == 52:
+            tagdata = _u5_to_bitarray(data[pos : pos + length])
+            payment_hash = _trim_to_bytes(tagdata).hex()
+        pos += length
+
+    if payment_hash is None:
+        raise ValueError("No payment hash found")
+    return amount_msat, payment_hash
+
+
 def encode(options):
     """Convert options into LnAddr and pass it to the encoder"""
     addr = LnAddr()
@@ -373,7 +373,9 @@ async def check_transaction_status(
         return PaymentStatus(None)
     if not payment.pending:
         # note: before, we still checked the status of the payment again
-        return PaymentStatus(True)
+        # Payment.from_row fills a missing preimage with zeros, don't report it
+        preimage = payment.preimage if payment.preimage != "0" * 64 else None
+        return PaymentStatus(True, preimage=preimage)
 
     status: PaymentStatus = await payment.check_status()
     return status
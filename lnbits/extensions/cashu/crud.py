@@ -2,7 +2,8 @@ import os
 import random
 import time
 from binascii import hexlify, unhexlify
-from typing import Any, List, Optional, Union
+from collections import OrderedDict
+from typing import Any, List, Optional, Tuple, Union
 
 from cashu.core.base import MintKeyset
 from embit import bip32, bip39, ec, script
@@ -42,9 +43,31 @@ async def create_cashu(
     return cashu
 
 
+# every mint endpoint resolves its cashu first, so keep recently used mints
+# in memory instead of hitting the database on each request
+CASHU_CACHE_SIZE = 1024
+CASHU_CACHE_TTL = 60  # seconds
+_cashu_cache: "OrderedDict[str, Tuple[float, Cashu]]" = OrderedDict()
+
+
 async def get_cashu(cashu_id) -> Optional[Cashu]:
+    cached = _cashu_cache.get(cashu_id)
+    if cached and cached[0] > time.monotonic():
+        _cashu_cache.move_to_end(cashu_id)
+        return cached[1]
+
     row = await db.fetchone("SELECT * FROM cashu.cashu WHERE id = ?", (cashu_id,))
-    return Cashu(**row) if row else None
+    if not row:
+        _cashu_cache.pop(cashu_id, None)
+        return None
+
+    cashu = Cashu(**row)
+    _cashu_cache[cashu_id] = (time.monotonic() + CASHU_CACHE_TTL, cashu)
+    _cashu_cache.move_to_end(cashu_id)
+    if len(_cashu_cache) > CASHU_CACHE_SIZE:
+        # evict the least recently used mint
+        _cashu_cache.popitem(last=False)
+    return cashu
 
 
 async def get_cashus(wallet_ids: Union[str, List[str]]) -> List[Cashu]:
@@ -61,3 +84,4 @@ async def get_cashus(wallet_ids: Union[str, List[str]]) -> List[Cashu]:
 
 async def delete_cashu(cashu_id) -> None:
     await db.execute("DELETE FROM cashu.cashu WHERE id = ?", (cashu_id,))
+    _cashu_cache.pop(cashu_id, None)
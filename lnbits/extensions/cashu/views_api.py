@@ -1,11 +1,13 @@
+import asyncio
 import json
 import math
+import os
+from concurrent.futures import ThreadPoolExecutor
 from http import HTTPStatus
-from typing import Dict, List, Union
-
-import httpx
+from typing import Dict, List, Optional, Union
 
 # -------- cashu imports
+import httpx
 from cashu.core.base import (
     BlindedSignature,
     CheckFeesRequest,
@@ -20,8 +22,9 @@ from cashu.core.base import (
     Proof,
     SplitRequest,
 )
-from fastapi import Query
+from fastapi import Query, Request, Response
 from fastapi.params import Depends
+from fastapi.responses import JSONResponse
 from lnurl import decode as decode_lnurl
 from loguru import logger
 from secp256k1 import PublicKey
@@ -49,6 +52,26 @@ from .models import Cashu
 
 LIGHTNING = True
 
+# proof verification is pure secp256k1 math, run it off the event loop
+crypto_pool = ThreadPoolExecutor(max_workers=os.cpu_count())
+
+
+async def verify_proofs(proofs: List[Proof]) -> bool:
+    """
+    Verify all proofs concurrently. Raises if a proof can't be verified at
+    all, e.g. because it was already spent.
+    """
+    loop = asyncio.get_running_loop()
+    results = await asyncio.gather(
+        *[loop.run_in_executor(crypto_pool, ledger._verify_proof, p) for p in proofs],
+        return_exceptions=True,
+    )
+    for result in results:
+        if isinstance(result, Exception):
+            raise result
+    return all(results)
+
+
 ########################################
 ############### LNBITS MINTS ###########
 ########################################
@@ -67,7 +90,8 @@ async def api_cashus(
         if user:
             wallet_ids = user.wallet_ids
 
-    return [cashu.dict() for cashu in await get_cashus(wallet_ids)]
+    # fields are plain json types, so skip fastapi's jsonable_encoder pass
+    return JSONResponse([cashu.dict() for cashu in await get_cashus(wallet_ids)])
 
 
 @cashu_ext.post("/api/v1/mints", status_code=HTTPStatus.CREATED)
@@ -117,8 +141,33 @@ async def api_cashu_delete(
 #######################################
 
 
+# keysets are immutable, so each one is serialized only once
+keyset_json_cache: Dict[str, bytes] = {}
+
+
+def keyset_not_modified(request: Request, response: Response, keyset_id: str) -> bool:
+    """
+    Keysets never change once created, so let clients cache them and
+    revalidate with the keyset id as ETag.
+    """
+    etag = f'"{keyset_id}"'
+    # a 304 must carry the same caching headers as the 200 would
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "public, max-age=86400, immutable"
+
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    # the header may list several tags, compare them weakly (RFC 7232 2.3.2)
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    tags = [tag[2:] if tag.startswith("W/") else tag for tag in tags]
+    return "*" in tags or etag in tags
+
+
 @cashu_ext.get("/api/v1/{cashu_id}/keys", status_code=HTTPStatus.OK)
-async def keys(cashu_id: str = Query(None)) -> dict[int, str]:
+async def keys(
+    request: Request, response: Response, cashu_id: str = Query(None)
+) -> Response:
     """Get the public keys of the mint"""
     cashu: Union[Cashu, None] = await get_cashu(cashu_id)
 
@@ -127,11 +176,25 @@ async def keys(cashu_id: str = Query(None)) -> dict[int, str]:
             status_code=HTTPStatus.NOT_FOUND, detail="Mint does not exist."
         )
 
-    return ledger.get_keyset(keyset_id=cashu.keyset_id)
+    if keyset_not_modified(request, response, cashu.keyset_id):
+        return Response(status_code=HTTPStatus.NOT_MODIFIED, headers=response.headers)
+
+    content = keyset_json_cache.get(cashu.keyset_id)
+    if content is None:
+        keyset = ledger.get_keyset(keyset_id=cashu.keyset_id)
+        content = json.dumps(keyset, separators=(",", ":")).encode()
+        keyset_json_cache[cashu.keyset_id] = content
+
+    # returning a response directly drops the headers set on `response`
+    return Response(
+        content=content, media_type="application/json", headers=response.headers
+    )
 
 
 @cashu_ext.get("/api/v1/{cashu_id}/keysets", status_code=HTTPStatus.OK)
-async def keysets(cashu_id: str = Query(None)) -> dict[str, list[str]]:
+async def keysets(
+    request: Request, response: Response, cashu_id: str = Query(None)
+) -> Union[Dict[str, List[str]], Response]:
     """Get the public keys of the mint"""
     cashu: Union[Cashu, None] = await get_cashu(cashu_id)
 
@@ -140,6 +203,9 @@ async def keysets(cashu_id: str = Query(None)) -> dict[str, list[str]]:
             status_code=HTTPStatus.NOT_FOUND, detail="Mint does not exist."
         )
 
+    if keyset_not_modified(request, response, cashu.keyset_id):
+        return Response(status_code=HTTPStatus.NOT_MODIFIED, headers=response.headers)
+
     return {"keysets": [cashu.keyset_id]}
 
 
@@ -198,9 +264,13 @@ async def mint_coins(
         )
 
     if LIGHTNING:
-        invoice: Invoice = await ledger.crud.get_lightning_invoice(
-            db=ledger.db, hash=payment_hash
-        )
+        try:
+            invoice: Optional[Invoice] = await ledger.crud.get_lightning_invoice(
+                db=ledger.db, hash=payment_hash
+            )
+        except TypeError:
+            # the ledger builds the invoice from whatever row it found
+            invoice = None
         if invoice is None:
             raise HTTPException(
                 status_code=HTTPStatus.NOT_FOUND,
@@ -212,7 +282,7 @@ async def mint_coins(
                 detail="Tokens already issued for this invoice.",
             )
 
-        total_requested = sum([bm.amount for bm in data.blinded_messages])
+        total_requested = sum(bm.amount for bm in data.blinded_messages)
         if total_requested > invoice.amount:
             raise HTTPException(
                 status_code=HTTPStatus.PAYMENT_REQUIRED,
@@ -231,9 +301,11 @@ async def mint_coins(
         promises = await ledger._generate_promises(
             B_s=data.blinded_messages, keyset=keyset
         )
-        assert len(promises), HTTPException(
-            status_code=HTTPStatus.INTERNAL_SERVER_ERROR, detail="No promises returned."
-        )
+        if not promises:
+            raise HTTPException(
+                status_code=HTTPStatus.INTERNAL_SERVER_ERROR,
+                detail="No promises returned.",
+            )
         await ledger.crud.update_lightning_invoice(
             db=ledger.db, hash=payment_hash, issued=True
         )
@@ -260,31 +332,43 @@ async def melt_coins(
     # !!!!!!! MAKE SURE THAT PROOFS ARE ONLY FROM THIS CASHU KEYSET ID
     # THIS IS NECESSARY BECAUSE THE CASHU BACKEND WILL ACCEPT ANY VALID
     # TOKENS
-    assert all([p.id == cashu.keyset_id for p in proofs]), HTTPException(
-        status_code=HTTPStatus.METHOD_NOT_ALLOWED,
-        detail="Error: Tokens are from another mint.",
-    )
+    keyset_id = cashu.keyset_id
+    if any(p.id != keyset_id for p in proofs):
+        raise HTTPException(
+            status_code=HTTPStatus.METHOD_NOT_ALLOWED,
+            detail="Error: Tokens are from another mint.",
+        )
 
-    assert all([ledger._verify_proof(p) for p in proofs]), HTTPException(
-        status_code=HTTPStatus.BAD_REQUEST,
-        detail="Could not verify proofs.",
-    )
+    try:
+        verified = await verify_proofs(proofs)
+    except Exception as e:
+        logger.error(e)
+        verified = False
+    if not verified:
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST,
+            detail="Could not verify proofs.",
+        )
 
-    total_provided = sum([p["amount"] for p in proofs])
-    invoice_obj = bolt11.decode(invoice)
-    amount = math.ceil(invoice_obj.amount_msat / 1000)
+    total_provided = sum(p.amount for p in proofs)
+    amount_msat, payment_hash = bolt11.parse_amount_and_hash(invoice)
+    amount = math.ceil(amount_msat / 1000)
 
-    internal_checking_id = await check_internal(invoice_obj.payment_hash)
+    internal_checking_id = await check_internal(payment_hash)
 
     if not internal_checking_id:
-        fees_msat = fee_reserve(invoice_obj.amount_msat)
+        fees_msat = fee_reserve(amount_msat)
     else:
         fees_msat = 0
-    assert total_provided >= amount + math.ceil(fees_msat / 1000), Exception(
-        f"Provided proofs ({total_provided} sats) not enough for Lightning payment ({amount + fees_msat} sats)."
-    )
+    fees = math.ceil(fees_msat / 1000)
+    if total_provided < amount + fees:
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST,
+            detail=f"Provided proofs ({total_provided} sats) not enough for Lightning payment ({amount + fees} sats).",
+        )
     logger.debug(f"Cashu: Initiating payment of {total_provided} sats")
-    await pay_invoice(
+    # check the status of the hash that was actually paid, not the parsed one
+    payment_hash = await pay_invoice(
         wallet_id=cashu.wallet,
         payment_request=invoice,
         description=f"Pay cashu invoice",
@@ -293,10 +377,10 @@ async def melt_coins(
 
     try:
         logger.debug(
-            f"Cashu: Wallet {cashu.wallet} checking PaymentStatus of {invoice_obj.payment_hash}"
+            f"Cashu: Wallet {cashu.wallet} checking PaymentStatus of {payment_hash}"
         )
         status: PaymentStatus = await check_transaction_status(
-            cashu.wallet, invoice_obj.payment_hash
+            cashu.wallet, payment_hash
         )
         logger.debug(f"Cashu: Got status.paid: {status.paid}")
         if status.paid == True:
@@ -337,11 +421,11 @@ async def check_fees(
         raise HTTPException(
             status_code=HTTPStatus.NOT_FOUND, detail="Mint does not exist."
         )
-    invoice_obj = bolt11.decode(payload.pr)
-    internal_checking_id = await check_internal(invoice_obj.payment_hash)
+    amount_msat, payment_hash = bolt11.parse_amount_and_hash(payload.pr)
+    internal_checking_id = await check_internal(payment_hash)
 
     if not internal_checking_id:
-        fees_msat = fee_reserve(invoice_obj.amount_msat)
+        fees_msat = fee_reserve(amount_msat)
     else:
         fees_msat = 0
     return CheckFeesResponse(fee=math.ceil(fees_msat / 1000))
@@ -365,7 +449,8 @@ async def split(
     # !!!!!!! MAKE SURE THAT PROOFS ARE ONLY FROM THIS CASHU KEYSET ID
     # THIS IS NECESSARY BECAUSE THE CASHU BACKEND WILL ACCEPT ANY VALID
     # TOKENS
-    if not all([p.id == cashu.keyset_id for p in proofs]):
+    keyset_id = cashu.keyset_id
+    if any(p.id != keyset_id for p in proofs):
         raise HTTPException(
             status_code=HTTPStatus.METHOD_NOT_ALLOWED,
             detail="Error: Tokens are from another mint.",
@@ -373,7 +458,10 @@ async def split(
 
     amount = payload.amount
     outputs = payload.outputs.blinded_messages
-    assert outputs, Exception("no outputs provided.")
+    if not outputs:
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST, detail="No outputs provided."
+        )
     split_return = None
     try:
         keyset = ledger.keysets.keysets[cashu.keyset_id]
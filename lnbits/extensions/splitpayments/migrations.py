@@ -1,3 +1,6 @@
+from lnbits.db import POSTGRES
+
+
 async def m001_initial(db):
     """
     Initial split payment table.
@@ -20,6 +23,15 @@ async def m002_float_percent(db):
     """
     Add float percent and migrates the existing data.
     """
+    if db.type == POSTGRES:
+        # a single in-place type change keeps the data and the constraints
+        await db.execute(
+            "ALTER TABLE splitpayments.targets ALTER COLUMN percent TYPE REAL;"
+        )
+        return
+
+    # sqlite can't change a column type and cockroach only can outside of a
+    # transaction, so copy everything to a new table
     await db.execute("ALTER TABLE splitpayments.targets RENAME TO splitpayments_old")
     await db.execute(
         """
@@ -29,7 +29,7 @@ async def on_invoice_paid(payment: Payment) -> None:
     if not targets:
         return
 
-    total_percent = sum([target.percent for target in targets])
+    total_percent = sum(target.percent for target in targets)
 
     if total_percent > 100:
         logger.error("splitpayment failure: total percent adds up to more than 100%")
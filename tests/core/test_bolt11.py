@@ -0,0 +1,57 @@
+import time
+
+import bitstring  # type: ignore
+import pytest
+import secp256k1
+from bech32 import bech32_encode
+
+from lnbits import bolt11
+
+PRIVKEY = "e126f68f7eafcc8b74f54d269fe206be715000f94dac067d1c04a8ca3b2db734"
+
+# from the examples in the BOLT #11 spec
+SPEC_INVOICE = "lnbc2500u1pvjluezpp5qqqsyqcyq5rqwzqfqqqsyqcyq5rqwzqfqqqsyqcyq5rqwzqfqypqdq5xysxxatsyp3k7enxv4jsxqzpuaztrnwngzn3kdzw5hydlzf03qdgm2hdq27cqv3agm2awhz5se903vruatfhq77w3ls4evs3ch9zw97j25emudupq63nyw24cg27h2rspfj9srp"
+
+
+def sign_invoice(hrp: str, data: bitstring.BitArray) -> str:
+    privkey = secp256k1.PrivateKey(bytes.fromhex(PRIVKEY))
+    sig = privkey.ecdsa_sign_recoverable(
+        bytearray([ord(c) for c in hrp]) + data.tobytes()
+    )
+    sig, recid = privkey.ecdsa_recoverable_serialize(sig)
+    data += bytes(sig) + bytes([recid])
+    return bech32_encode(hrp, bolt11.bitarray_to_u5(data))
+
+
+def test_parse_amount_and_hash_matches_decode():
+    data = bitstring.pack("uint:35", int(time.time()))
+    data += bolt11.tagged_bytes("p", bytes.fromhex("ab" * 32))
+    data += bolt11.tagged_bytes("d", b"test")
+
+    for pr in [SPEC_INVOICE, sign_invoice("lnbc10u", data)]:
+        invoice = bolt11.decode(pr)
+        assert bolt11.parse_amount_and_hash(pr) == (
+            invoice.amount_msat,
+            invoice.payment_hash,
+        )
+
+
+def test_parse_amount_and_hash_duplicate_payment_hash():
+    data = bitstring.pack("uint:35", int(time.time()))
+    data += bolt11.tagged_bytes("p", bytes.fromhex("00" * 32))
+    data += bolt11.tagged_bytes("p", bytes.fromhex("11" * 32))
+    data += bolt11.tagged_bytes("d", b"two payment hashes")
+    pr = sign_invoice("lnbc10u", data)
+
+    invoice = bolt11.decode(pr)
+    assert invoice.payment_hash == "11" * 32
+    assert bolt11.parse_amount_and_hash(pr) == (1_000_000, "11" * 32)
+
+
+def test_parse_amount_and_hash_without_payment_hash():
+    data = bitstring.pack("uint:35", int(time.time()))
+    data += bolt11.tagged_bytes("d", b"no payment hash")
+    pr = sign_invoice("lnbc10u", data)
+
+    with pytest.raises(ValueError):
+        bolt11.parse_amount_and_hash(pr)
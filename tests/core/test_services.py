@@ -0,0 +1,39 @@
+import hashlib
+import os
+
+import pytest
+
+from lnbits.core.crud import create_payment
+from lnbits.core.services import check_transaction_status
+
+
+async def create_settled_payment(wallet_id: str, preimage=None) -> str:
+    payment_hash = hashlib.sha256(os.urandom(32)).hexdigest()
+    await create_payment(
+        wallet_id=wallet_id,
+        checking_id=payment_hash,
+        payment_request="",
+        payment_hash=payment_hash,
+        amount=-1000,
+        memo="settled",
+        preimage=preimage,
+        pending=False,
+    )
+    return payment_hash
+
+
+@pytest.mark.asyncio
+async def test_check_transaction_status_settled_with_preimage(app, to_wallet):
+    preimage = os.urandom(32).hex()
+    payment_hash = await create_settled_payment(to_wallet.id, preimage)
+    status = await check_transaction_status(to_wallet.id, payment_hash)
+    assert status.paid
+    assert status.preimage == preimage
+
+
+@pytest.mark.asyncio
+async def test_check_transaction_status_settled_without_preimage(app, to_wallet):
+    payment_hash = await create_settled_payment(to_wallet.id)
+    status = await check_transaction_status(to_wallet.id, payment_hash)
+    assert status.paid
+    assert status.preimage is None
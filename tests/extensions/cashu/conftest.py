@@ -0,0 +1,47 @@
+import pytest_asyncio
+
+from lnbits.core.crud import create_account, create_wallet
+from lnbits.extensions.cashu import ledger
+from lnbits.extensions.cashu.crud import create_cashu
+from lnbits.extensions.cashu.models import Cashu
+from lnbits.extensions.cashu.tasks import startup_cashu_mint
+from lnbits.helpers import urlsafe_short_hash
+
+
+async def create_test_cashu(wallet_id: str, name: str) -> Cashu:
+    return await create_cashu(
+        cashu_id=urlsafe_short_hash(),
+        keyset_id=urlsafe_short_hash(),
+        wallet_id=wallet_id,
+        data=Cashu(name=name),
+    )
+
+
+@pytest_asyncio.fixture
+async def cashu_wallet():
+    user = await create_account()
+    wallet = await create_wallet(user_id=user.id, wallet_name="cashu_test")
+    return wallet
+
+
+@pytest_asyncio.fixture
+async def cashu(cashu_wallet):
+    return await create_test_cashu(cashu_wallet.id, "Test Mint")
+
+
+@pytest_asyncio.fixture(scope="session")
+async def cashu_ledger(app):
+    # the extension's startup task is not run by the test client
+    await startup_cashu_mint()
+    return ledger
+
+
+@pytest_asyncio.fixture
+async def cashu_mint(client, cashu_ledger, cashu_wallet):
+    response = await client.post(
+        "/cashu/api/v1/mints",
+        json={"name": "Test Mint"},
+        headers={"X-Api-Key": cashu_wallet.adminkey},
+    )
+    assert response.status_code == 201
+    return response.json()
@@ -0,0 +1,138 @@
+import pytest
+from secp256k1 import PrivateKey
+
+from lnbits.extensions.cashu import ledger, views_api
+from lnbits.wallets.base import PaymentStatus
+from tests.conftest import app, client
+from tests.extensions.cashu.conftest import cashu_ledger, cashu_mint, cashu_wallet
+
+
+def fake_proof(cashu_mint, secret: str) -> dict:
+    # a valid point, but not the signature of the mint on `secret`
+    C = ledger.get_keyset(keyset_id=cashu_mint["keyset_id"])[1]
+    return {"id": cashu_mint["keyset_id"], "amount": 1, "secret": secret, "C": C}
+
+
+@pytest.mark.asyncio
+async def test_cashu_melt_invalid_proof(client, cashu_mint):
+    response = await client.post(
+        f"/cashu/api/v1/{cashu_mint['id']}/melt",
+        json={"proofs": [fake_proof(cashu_mint, "invalid")], "invoice": "lnbc1"},
+    )
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Could not verify proofs."}
+
+
+@pytest.mark.asyncio
+async def test_cashu_melt_spent_proof(client, cashu_mint, monkeypatch):
+    monkeypatch.setattr(ledger, "proofs_used", {"spent"})
+    response = await client.post(
+        f"/cashu/api/v1/{cashu_mint['id']}/melt",
+        json={"proofs": [fake_proof(cashu_mint, "spent")], "invoice": "lnbc1"},
+    )
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Could not verify proofs."}
+
+
+@pytest.fixture
+def status_checks(monkeypatch):
+    # record payment status checks instead of asking the backend
+    checks = []
+
+    async def check_transaction_status(wallet_id, payment_hash):
+        checks.append(payment_hash)
+        return PaymentStatus(True)
+
+    monkeypatch.setattr(views_api, "check_transaction_status", check_transaction_status)
+    return checks
+
+
+async def request_mint(client, cashu_mint, amount: int) -> str:
+    response = await client.get(
+        f"/cashu/api/v1/{cashu_mint['id']}/mint", params={"amount": amount}
+    )
+    assert response.status_code == 200
+    return response.json()["hash"]
+
+
+async def mint(client, cashu_mint, payment_hash: str, amount: int):
+    B_ = PrivateKey().pubkey.serialize().hex()
+    return await client.post(
+        f"/cashu/api/v1/{cashu_mint['id']}/mint",
+        params={"payment_hash": payment_hash},
+        json={"blinded_messages": [{"amount": amount, "B_": B_}]},
+    )
+
+
+@pytest.mark.asyncio
+async def test_cashu_mint_unknown_invoice(client, cashu_mint, status_checks):
+    response = await mint(client, cashu_mint, "0" * 64, 8)
+    assert response.status_code == 404
+    assert status_checks == []
+
+
+@pytest.mark.asyncio
+async def test_cashu_mint_already_issued(client, cashu_mint, status_checks):
+    payment_hash = await request_mint(client, cashu_mint, 8)
+    await ledger.crud.update_lightning_invoice(
+        db=ledger.db, hash=payment_hash, issued=True
+    )
+    response = await mint(client, cashu_mint, payment_hash, 8)
+    assert response.status_code == 402
+    assert response.json() == {"detail": "Tokens already issued for this invoice."}
+    assert status_checks == []
+
+
+@pytest.mark.asyncio
+async def test_cashu_mint_amount_too_high(client, cashu_mint, status_checks):
+    payment_hash = await request_mint(client, cashu_mint, 8)
+    response = await mint(client, cashu_mint, payment_hash, 16)
+    assert response.status_code == 402
+    assert status_checks == []
+
+
+@pytest.mark.asyncio
+async def test_cashu_mint(client, cashu_mint, status_checks):
+    payment_hash = await request_mint(client, cashu_mint, 8)
+    response = await mint(client, cashu_mint, payment_hash, 8)
+    assert response.status_code == 200
+    assert status_checks == [payment_hash]
+    assert [promise["amount"] for promise in response.json()] == [8]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("endpoint", ["keys", "keysets"])
+async def test_cashu_keysets_cache_headers(client, cashu_mint, endpoint):
+    response = await client.get(f"/cashu/api/v1/{cashu_mint['id']}/{endpoint}")
+    assert response.status_code == 200
+    assert response.headers["etag"] == f'"{cashu_mint["keyset_id"]}"'
+    assert response.headers["cache-control"] == "public, max-age=86400, immutable"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("endpoint", ["keys", "keysets"])
+@pytest.mark.parametrize(
+    "if_none_match",
+    ['"{id}"', 'W/"{id}"', '"other", "{id}"', "*"],
+)
+async def test_cashu_keysets_not_modified(client, cashu_mint, endpoint, if_none_match):
+    response = await client.get(
+        f"/cashu/api/v1/{cashu_mint['id']}/{endpoint}",
+        headers={"If-None-Match": if_none_match.format(id=cashu_mint["keyset_id"])},
+    )
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == f'"{cashu_mint["keyset_id"]}"'
+    assert response.headers["cache-control"] == "public, max-age=86400, immutable"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("endpoint", ["keys", "keysets"])
+async def test_cashu_keysets_modified(client, cashu_mint, endpoint):
+    response = await client.get(
+        f"/cashu/api/v1/{cashu_mint['id']}/{endpoint}",
+        headers={"If-None-Match": '"other"'},
+    )
+    assert response.status_code == 200
+    assert response.json()
+    assert response.headers["etag"] == f'"{cashu_mint["keyset_id"]}"'
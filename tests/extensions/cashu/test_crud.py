@@ -0,0 +1,51 @@
+from collections import OrderedDict
+
+import pytest
+
+from lnbits.extensions.cashu import crud, db
+from lnbits.extensions.cashu.crud import delete_cashu, get_cashu
+from tests.conftest import app
+from tests.extensions.cashu.conftest import cashu, cashu_wallet, create_test_cashu
+
+
+async def rename_in_db(cashu_id: str, name: str):
+    await db.execute("UPDATE cashu.cashu SET name = ? WHERE id = ?", (name, cashu_id))
+
+
+@pytest.mark.asyncio
+async def test_cashu_cache_hit(app, cashu):
+    await rename_in_db(cashu.id, "Renamed Mint")
+    # served from the cache filled by create_cashu, no db read
+    cached = await get_cashu(cashu.id)
+    assert cached
+    assert cached.name == "Test Mint"
+
+
+@pytest.mark.asyncio
+async def test_cashu_cache_expiry(app, cashu_wallet, monkeypatch):
+    # entries stored with a zero ttl are expired right away
+    monkeypatch.setattr(crud, "CASHU_CACHE_TTL", 0)
+    cashu = await create_test_cashu(cashu_wallet.id, "Test Mint")
+    await rename_in_db(cashu.id, "Renamed Mint")
+    fresh = await get_cashu(cashu.id)
+    assert fresh
+    assert fresh.name == "Renamed Mint"
+
+
+@pytest.mark.asyncio
+async def test_cashu_cache_delete(app, cashu):
+    assert await get_cashu(cashu.id)
+    await delete_cashu(cashu.id)
+    assert await get_cashu(cashu.id) is None
+
+
+@pytest.mark.asyncio
+async def test_cashu_cache_evicts_least_recently_used(app, cashu_wallet, monkeypatch):
+    monkeypatch.setattr(crud, "_cashu_cache", OrderedDict())
+    monkeypatch.setattr(crud, "CASHU_CACHE_SIZE", 2)
+    first = await create_test_cashu(cashu_wallet.id, "First Mint")
+    second = await create_test_cashu(cashu_wallet.id, "Second Mint")
+    # a hit on the first mint makes the second one the least recently used
+    assert await get_cashu(first.id)
+    third = await create_test_cashu(cashu_wallet.id, "Third Mint")
+    assert list(crud._cashu_cache) == [first.id, third.id]